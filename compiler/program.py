@@ -40,6 +40,9 @@ class Program:
         assembly = [eq_to_assembly(constraint) for constraint in constraints]
         self.constraints = assembly
         self.group_order = group_order
+        self._wire_keys: Optional[
+            tuple[list[Optional[str]], list[Optional[str]], list[Optional[str]]]
+        ] = None
 
     def common_preprocessed_input(self) -> CommonPreprocessedInput:
         L, R, M, O, C = self.make_gate_polynomials()
@@ -67,6 +70,20 @@ class Program:
     def wires(self) -> list[GateWires]:
         return [constraint.wires for constraint in self.constraints]
 
+    # The variable names on the L, R and O wires of each gate, as three flat
+    # lists in gate order. These are computed once and reused for every proof
+    def wire_keys(
+        self,
+    ) -> tuple[list[Optional[str]], list[Optional[str]], list[Optional[str]]]:
+        if self._wire_keys is None:
+            wires = self.wires()
+            self._wire_keys = (
+                [w.L for w in wires],
+                [w.R for w in wires],
+                [w.O for w in wires],
+            )
+        return self._wire_keys
+
     def make_s_polynomials(self) -> dict[Column, Polynomial]:
         # For each variable, extract the list of (column, row) positions
         # where that variable is used
@@ -1,6 +1,7 @@
 from py_ecc.fields.field_elements import FQ as Field
 import py_ecc.bn128 as b
 from typing import NewType
+import functools
 
 primitive_root = 5
 G1Point = NewType("G1Point", tuple[b.FQ, b.FQ])
@@ -18,12 +19,68 @@ class Scalar(Field):
     # Gets the full list of roots of unity of a given group order
     @classmethod
     def roots_of_unity(cls, group_order: int):
+        return list(cls._roots_of_unity(group_order))
+
+    # The roots only depend on the group order, so compute them once per
+    # order and hand out copies of the cached tuple
+    @classmethod
+    @functools.lru_cache(maxsize=None)
+    def _roots_of_unity(cls, group_order: int) -> tuple["Scalar", ...]:
         o = [Scalar(1), cls.root_of_unity(group_order)]
         while len(o) < group_order:
             o.append(o[-1] * o[1])
+        return tuple(o)
+
+    # Gets the roots of unity of a given group order multiplied by 1, 2 and 3,
+    # i.e. the labels of the left, right and output wire cells of each row.
+    # Cached per order like the roots themselves
+    @classmethod
+    @functools.lru_cache(maxsize=None)
+    def roots_of_unity_labels(
+        cls, group_order: int
+    ) -> tuple[tuple["Scalar", ...], tuple["Scalar", ...], tuple["Scalar", ...]]:
+        roots = cls._roots_of_unity(group_order)
+        return (
+            roots,
+            tuple(cls.from_reduced(2 * r.n % cls.field_modulus) for r in roots),
+            tuple(cls.from_reduced(3 * r.n % cls.field_modulus) for r in roots),
+        )
+
+    # Wraps an integer that is already reduced modulo the field modulus,
+    # skipping the type checks and the reduction done by the constructor
+    @classmethod
+    def from_reduced(cls, n: int) -> "Scalar":
+        assert 0 <= n < cls.field_modulus
+        o = cls.__new__(cls)
+        o.n = n
+        return o
+
+    # Inverts a list of field elements with a single modular inverse
+    # (Montgomery's trick): take prefix products, invert the last one, then
+    # walk backwards peeling off one element at a time. Like division, zero
+    # maps to zero; zeros are skipped so they don't wipe out the other values
+    @classmethod
+    def batch_inverse(cls, values: list["Scalar"]) -> list["Scalar"]:
+        m = cls.field_modulus
+        prefix = []
+        acc = 1
+        for x in values:
+            if x.n != 0:
+                acc = acc * x.n % m
+            prefix.append(acc)
+        inv = (1 / cls(acc)).n
+        o = [FR_ZERO] * len(values)
+        for i in range(len(values) - 1, -1, -1):
+            if values[i].n == 0:
+                continue
+            o[i] = cls.from_reduced(inv * (prefix[i - 1] if i > 0 else 1) % m)
+            inv = inv * values[i].n % m
         return o
 
 
+FR_ZERO = Scalar(0)
+FR_ONE = Scalar(1)
+
 Base = NewType("Base", b.FQ)
 
 
@@ -49,6 +106,18 @@ def ec_lincomb(pairs):
     # return o
 
 
+# Computes several linear combinations over the same points at once, e.g.
+# commitments to several polynomials against the same setup. The power sets
+# over the points are built once and shared between all of the combinations
+def ec_lincomb_batch(points, factor_lists):
+    return lincomb_batch(
+        points,
+        [[int(n) % b.curve_order for n in factors] for factors in factor_lists],
+        b.add,
+        b.Z1,
+    )
+
+
 ################################################################
 # multicombs
 ################################################################
@@ -89,15 +158,26 @@ def multisubset(numbers, subsets, adder=lambda x, y: x + y, zero=0):
 # Reduces a linear combination `numbers[0] * factors[0] + numbers[1] * factors[1] + ...`
 # into a multi-subset problem, and computes the result efficiently
 def lincomb(numbers, factors, adder=lambda x, y: x + y, zero=0):
-    # Maximum bit length of a number; how many subsets we need to make
-    maxbitlen = max(len(bin(f)) - 2 for f in factors)
-    # Compute the subsets: the ith subset contains the numbers whose corresponding factor
-    # has a 1 at the ith bit
-    subsets = [
-        {i for i in range(len(numbers)) if factors[i] & (1 << j)}
-        for j in range(maxbitlen + 1)
-    ]
-    subset_sums = multisubset(numbers, subsets, adder=adder, zero=zero)
+    return lincomb_batch(numbers, [factors], adder=adder, zero=zero)[0]
+
+
+# Same as lincomb, but for several lists of factors over the same numbers. All
+# of the subsets go into a single multi-subset problem, so the power sets are
+# only computed once
+def lincomb_batch(numbers, factor_lists, adder=lambda x, y: x + y, zero=0):
+    subsets = []
+    subset_counts = []
+    for factors in factor_lists:
+        # Maximum bit length of a number; how many subsets we need to make
+        maxbitlen = max(len(bin(f)) - 2 for f in factors)
+        # Compute the subsets: the ith subset contains the numbers whose corresponding factor
+        # has a 1 at the ith bit
+        subsets += [
+            {i for i in range(len(numbers)) if factors[i] & (1 << j)}
+            for j in range(maxbitlen + 1)
+        ]
+        subset_counts.append(maxbitlen + 1)
+    all_subset_sums = multisubset(numbers, subsets, adder=adder, zero=zero)
     # For example, suppose a value V has factor 6 (011 in increasing-order binary). Subset 0
     # will not have V, subset 1 will, and subset 2 will. So if we multiply the output of adding
     # subset 0 with twice the output of adding subset 1, with four times the output of adding
@@ -105,10 +185,16 @@ def lincomb(numbers, factors, adder=lambda x, y: x + y, zero=0):
     # value. So `subset_0_sum + 2 * subset_1_sum + 4 * subset_2_sum` gives us the result we want.
     # Here, we compute this as `((subset_2_sum * 2) + subset_1_sum) * 2 + subset_0_sum` for
     # efficiency: an extra `maxbitlen * 2` group operations.
-    o = zero
-    for i in range(len(subsets) - 1, -1, -1):
-        o = adder(adder(o, o), subset_sums[i])
-    return o
+    results = []
+    start = 0
+    for count in subset_counts:
+        subset_sums = all_subset_sums[start : start + count]
+        start += count
+        o = zero
+        for i in range(count - 1, -1, -1):
+            o = adder(adder(o, o), subset_sums[i])
+        results.append(o)
+    return results
 
 
 # Tests go here
@@ -149,5 +235,30 @@ def test_lincomb(numcount, bitlength=256):
     )
 
 
+def test_lincomb_batch(numcount, batchsize=3, bitlength=256):
+    numbers = [random.randrange(10**20) for _ in range(numcount)]
+    factor_lists = [
+        [random.randrange(2**bitlength) for _ in range(numcount)]
+        for _ in range(batchsize)
+    ]
+    o = lincomb_batch(numbers, factor_lists)
+    for output, factors in zip(o, factor_lists):
+        assert output == sum([n * f for n, f in zip(numbers, factors)])
+
+
+def test_batch_inverse(numcount):
+    values = [
+        Scalar(0) if random.randrange(4) == 0 else Scalar(random.randrange(2**256))
+        for _ in range(numcount)
+    ]
+    for case in (values, [Scalar(0)] * 5, [Scalar(0)], [Scalar(7)], []):
+        o = Scalar.batch_inverse(case)
+        assert len(o) == len(case)
+        for x, inv in zip(case, o):
+            assert inv == 1 / x
+
+
 if __name__ == "__main__":
     test_lincomb(int(sys.argv[1]) if len(sys.argv) >= 2 else 80)
+    test_lincomb_batch(int(sys.argv[1]) if len(sys.argv) >= 2 else 80)
+    test_batch_inverse(int(sys.argv[1]) if len(sys.argv) >= 2 else 80)
@@ -1,5 +1,6 @@
-from curve import Scalar
+from curve import Scalar, FR_ZERO
 from enum import Enum
+import functools
 
 
 class Basis(Enum):
@@ -20,20 +21,27 @@ class Polynomial:
     def __eq__(self, other):
         return (self.basis == other.basis) and (self.values == other.values)
 
+    # Pointwise arithmetic works directly on the integer representations with
+    # a single modular reduction, which skips the type dispatch and double
+    # reduction of Scalar's own operators
     def __add__(self, other):
+        o, from_reduced = Scalar.field_modulus, Scalar.from_reduced
         if isinstance(other, Polynomial):
             assert len(self.values) == len(other.values)
             assert self.basis == other.basis
 
             return Polynomial(
-                [x + y for x, y in zip(self.values, other.values)],
+                [
+                    from_reduced((x.n + y.n) % o)
+                    for x, y in zip(self.values, other.values)
+                ],
                 self.basis,
             )
         else:
             assert isinstance(other, Scalar)
             if self.basis == Basis.LAGRANGE:
                 return Polynomial(
-                    [x + other for x in self.values],
+                    [from_reduced((x.n + other.n) % o) for x in self.values],
                     self.basis,
                 )
             else:
@@ -43,19 +51,23 @@ class Polynomial:
                 )
 
     def __sub__(self, other):
+        o, from_reduced = Scalar.field_modulus, Scalar.from_reduced
         if isinstance(other, Polynomial):
             assert len(self.values) == len(other.values)
             assert self.basis == other.basis
 
             return Polynomial(
-                [x - y for x, y in zip(self.values, other.values)],
+                [
+                    from_reduced((x.n - y.n) % o)
+                    for x, y in zip(self.values, other.values)
+                ],
                 self.basis,
             )
         else:
             assert isinstance(other, Scalar)
             if self.basis == Basis.LAGRANGE:
                 return Polynomial(
-                    [x - other for x in self.values],
+                    [from_reduced((x.n - other.n) % o) for x in self.values],
                     self.basis,
                 )
             else:
@@ -66,19 +78,23 @@ class Polynomial:
 
 
     def __mul__(self, other):
+        o, from_reduced = Scalar.field_modulus, Scalar.from_reduced
         if isinstance(other, Polynomial):
             assert self.basis == Basis.LAGRANGE
             assert self.basis == other.basis
             assert len(self.values) == len(other.values)
 
             return Polynomial(
-                [x * y for x, y in zip(self.values, other.values)],
+                [
+                    from_reduced(x.n * y.n % o)
+                    for x, y in zip(self.values, other.values)
+                ],
                 self.basis,
             )
         else:
             assert isinstance(other, Scalar)
             return Polynomial(
-                [x * other for x in self.values],
+                [from_reduced(x.n * other.n % o) for x in self.values],
                 self.basis,
             )
 
@@ -88,16 +104,19 @@ class Polynomial:
             assert self.basis == other.basis
             assert len(self.values) == len(other.values)
 
-            return Polynomial(
-                [x / y for x, y in zip(self.values, other.values)],
-                self.basis,
-            )
+            # One batched inversion of the divisor instead of one per value
+            return self * other.inverse()
         else:
             assert isinstance(other, Scalar)
-            return Polynomial(
-                [x / other for x in self.values],
-                self.basis,
-            )
+            return self * (1 / other)
+
+    # Pointwise inverse of a polynomial in evaluation form, computed with a
+    # single field inversion. Multiplying by this is much cheaper than
+    # dividing lane by lane when the same divisor is used more than once
+    def inverse(self):
+        assert self.basis == Basis.LAGRANGE
+
+        return Polynomial(Scalar.batch_inverse(self.values), self.basis)
 
     def shift(self, shift: int):
         assert self.basis == Basis.LAGRANGE
@@ -114,39 +133,42 @@ class Polynomial:
         # Fast Fourier transform, used to convert between polynomial coefficients
         # and a list of evaluations at the roots of unity
         # See https://vitalik.ca/general/2019/05/12/fft.html
-        def _fft(vals, modulus, roots_of_unity):
-            if len(vals) == 1:
-                return vals
-            L = _fft(vals[::2], modulus, roots_of_unity[::2])
-            R = _fft(vals[1::2], modulus, roots_of_unity[::2])
-            o = [0] * len(vals)
-            for i, (x, y) in enumerate(zip(L, R)):
-                y_times_root = y * roots_of_unity[i]
-                o[i] = (x + y_times_root) % modulus
-                o[i + len(L)] = (x - y_times_root) % modulus
-            return o
-
-        roots = [x.n for x in Scalar.roots_of_unity(len(self.values))]
-        o, nvals = Scalar.field_modulus, [x.n for x in self.values]
+        o = Scalar.field_modulus
         if inv:
             assert self.basis == Basis.LAGRANGE
             # Inverse FFT
-            invlen = Scalar(1) / len(self.values)
-            reversed_roots = [roots[0]] + roots[1:][::-1]
+            invlen = (Scalar(1) / len(self.values)).n
+            (vals,) = fft_ints([[x.n for x in self.values]], True)
             return Polynomial(
-                [Scalar(x) * invlen for x in _fft(nvals, o, reversed_roots)],
+                [Scalar.from_reduced(x * invlen % o) for x in vals],
                 Basis.MONOMIAL,
             )
         else:
             assert self.basis == Basis.MONOMIAL
             # Regular FFT
+            (vals,) = fft_ints([[x.n for x in self.values]], False)
             return Polynomial(
-                [Scalar(x) for x in _fft(nvals, o, roots)], Basis.LAGRANGE
+                [Scalar.from_reduced(x) for x in vals],
+                Basis.LAGRANGE,
             )
 
     def ifft(self):
         return self.fft(True)
 
+    # Runs the regular FFT over several polynomials of the same size at once,
+    # applying every butterfly to all of the polynomials before moving on
+    @staticmethod
+    def fft_batch(polys: list["Polynomial"]) -> list["Polynomial"]:
+        assert all(p.basis == Basis.MONOMIAL for p in polys)
+        size = len(polys[0].values)
+        assert all(len(p.values) == size for p in polys)
+
+        vecs = fft_ints([[x.n for x in p.values] for p in polys], False)
+        return [
+            Polynomial([Scalar.from_reduced(x) for x in v], Basis.LAGRANGE)
+            for v in vecs
+        ]
+
     # Converts a list of evaluations at [1, w, w**2... w**(n-1)] to
     # a list of evaluations at
     # [offset, offset * q, offset * q**2 ... offset * q**(4n-1)] where q = w**(1/4)
@@ -156,11 +178,14 @@ class Polynomial:
     # Resulting Polynomial f(x) = a_0 + a_1*(q * x)^1 + a_2*(q * x)^2 +
     # ... + a_(n - 1) * (q * x)^(n - 1) + [0 * x^n + ... + 0 * x^(3n - 1)],
     # where q = offset
+    # Polynomials already in monomial basis skip the initial inverse FFT
     def to_coset_extended_lagrange(self, offset):
-        assert self.basis == Basis.LAGRANGE
         group_order = len(self.values)
-        x_powers = self.ifft().values
-        x_powers = [(offset**i * x) for i, x in enumerate(x_powers)] + [Scalar(0)] * (
+        if self.basis == Basis.LAGRANGE:
+            x_powers = self.ifft().values
+        else:
+            x_powers = self.values
+        x_powers = [(offset**i * x) for i, x in enumerate(x_powers)] + [FR_ZERO] * (
             group_order * 3
         )
         return Polynomial(x_powers, Basis.MONOMIAL).fft()
@@ -182,17 +207,67 @@ class Polynomial:
     # Given a polynomial expressed as a list of evaluations at roots of unity,
     # evaluate it at x directly, without using an FFT to covert to coeffs first
     def barycentric_eval(self, x: Scalar):
-        assert self.basis == Basis.LAGRANGE
+        return Polynomial.barycentric_eval_batch([self], x)[0]
+
+    # Evaluates several polynomials of the same size at the same point x. The
+    # barycentric weights root / (x - root) only depend on x, so they are
+    # computed once for all of the polynomials, with a single field inversion
+    @staticmethod
+    def barycentric_eval_batch(polys: list["Polynomial"], x: Scalar) -> list[Scalar]:
+        assert all(p.basis == Basis.LAGRANGE for p in polys)
+        order = len(polys[0].values)
+        assert all(len(p.values) == order for p in polys)
 
-        order = len(self.values)
         roots_of_unity = Scalar.roots_of_unity(order)
-        return (
-            (Scalar(x) ** order - 1)
-            / order
-            * sum(
-                [
-                    value * root / (x - root)
-                    for value, root in zip(self.values, roots_of_unity)
-                ]
+        weights = [
+            (root * inv).n
+            for root, inv in zip(
+                roots_of_unity,
+                Scalar.batch_inverse([x - root for root in roots_of_unity]),
             )
-        )
+        ]
+        factor = (Scalar(x) ** order - 1) / order
+        return [
+            factor * Scalar(sum(value.n * w for value, w in zip(p.values, weights)))
+            for p in polys
+        ]
+
+
+# Everything about a radix-2 FFT of a given size that doesn't depend on the
+# values being transformed: the bit-reversal permutation of the inputs, and
+# the twiddle factors used by each layer of butterflies. Cached per size and
+# direction, so that repeated transforms only have to do the butterflies
+@functools.lru_cache(maxsize=None)
+def fft_plan(size: int, inv: bool) -> tuple[list[int], list[list[int]]]:
+    roots = [x.n for x in Scalar.roots_of_unity(size)]
+    if inv:
+        roots = [roots[0]] + roots[1:][::-1]
+    bits = size.bit_length() - 1
+    rev = [int(format(i, "0%db" % bits)[::-1], 2) for i in range(size)]
+    layers = []
+    half = 1
+    while half < size:
+        stride = size // (2 * half)
+        layers.append([roots[j * stride] for j in range(half)])
+        half *= 2
+    return rev, layers
+
+
+# Iterative radix-2 Cooley-Tukey FFT over lists of field elements given as
+# integers, all of the same size. Every butterfly is applied to all of the
+# lists before moving on to the next one, so they share one walk over the plan
+def fft_ints(vecs: list[list[int]], inv: bool) -> list[list[int]]:
+    o = Scalar.field_modulus
+    size = len(vecs[0])
+    rev, layers = fft_plan(size, inv)
+    vecs = [[v[r] for r in rev] for v in vecs]
+    for twiddles in layers:
+        half = len(twiddles)
+        for start in range(0, size, 2 * half):
+            for lo, root in enumerate(twiddles, start):
+                hi = lo + half
+                for v in vecs:
+                    x, y_times_root = v[lo], v[hi] * root
+                    v[lo] = (x + y_times_root) % o
+                    v[hi] = (x - y_times_root) % o
+    return vecs
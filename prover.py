@@ -2,9 +2,11 @@ from compiler.program import Program, CommonPreprocessedInput
 from utils import *
 from setup import *
 from typing import Optional
+from concurrent.futures import Executor
 from dataclasses import dataclass
 from transcript import Transcript, Message1, Message2, Message3, Message4, Message5
 from poly import Polynomial, Basis
+import itertools
 
 
 @dataclass
@@ -41,12 +43,27 @@ class Prover:
     setup: Setup
     program: Program
     pk: CommonPreprocessedInput
+    # Run the O(n) sanity checks on intermediate values
+    debug: bool
+    # Optional pool to compute each round's commitments in parallel
+    executor: Optional[Executor]
 
-    def __init__(self, setup: Setup, program: Program):
+    def __init__(
+        self,
+        setup: Setup,
+        program: Program,
+        debug: bool = False,
+        executor: Optional[Executor] = None,
+    ):
         self.group_order = program.group_order
         self.setup = setup
         self.program = program
         self.pk = program.common_preprocessed_input()
+        self.debug = debug
+        self.executor = executor
+        # Monomial coefficients of the preprocessed polynomials, shared by
+        # every proof made with this Prover
+        self.coeffs_cache: dict[str, Polynomial] = {}
 
     def prove(self, witness: dict[Optional[str], int]) -> Proof:
         # Initialise Fiat-Shamir transcript
@@ -57,7 +74,7 @@ class Prover:
         public_vars = self.program.get_public_assignments()
         PI = Polynomial(
             [Scalar(-witness[v]) for v in public_vars]
-            + [Scalar(0) for _ in range(self.group_order - len(public_vars))],
+            + [FR_ZERO] * (self.group_order - len(public_vars)),
             Basis.LAGRANGE,
         )
         self.PI = PI
@@ -94,16 +111,13 @@ class Prover:
         # - A_values: witness[program.wires()[i].L]
         # - B_values: witness[program.wires()[i].R]
         # - C_values: witness[program.wires()[i].O]
-        # A_values = witness[program.wires()[i].L]
-        A_values = [Scalar(0) for _ in range(self.group_order)]
-        B_values = [Scalar(0) for _ in range(self.group_order)]
-        C_values = [Scalar(0) for _ in range(self.group_order)]
-                
-        for i, gates in enumerate(self.program.wires()):
-            A_values[i] = Scalar(witness[gates.L])
-            B_values[i] = Scalar(witness[gates.R])
-            C_values[i] = Scalar(witness[gates.O])
-            
+        # padded with zeros up to the group order
+        L_keys, R_keys, O_keys = self.program.wire_keys()
+        padding = [FR_ZERO] * (self.group_order - len(L_keys))
+        A_values = [Scalar(witness[k]) for k in L_keys] + padding
+        B_values = [Scalar(witness[k]) for k in R_keys] + padding
+        C_values = [Scalar(witness[k]) for k in O_keys] + padding
+
         # Construct A, B, C Lagrange interpolation polynomials for
         # A_values, B_values, C_values
         self.A = Polynomial(A_values, Basis.LAGRANGE)
@@ -111,9 +125,9 @@ class Prover:
         self.C = Polynomial(C_values, Basis.LAGRANGE)
                                 
         # Compute a_1, b_1, c_1 commitments to A, B, C polynomials
-        a_1 = self.setup.commit(self.A)        
-        b_1 = self.setup.commit(self.B)        
-        c_1 = self.setup.commit(self.C)   
+        a_1, b_1, c_1 = self.setup.commit_batch(
+            [self.A, self.B, self.C], self.executor
+        )
 
         # Sanity check that witness fulfils gate constraints
         # Assert == [0, 0, 0, 0, 0, 0, 0, 0]
@@ -124,7 +138,7 @@ class Prover:
             + self.C * self.pk.QO
             + self.PI
             + self.pk.QC
-            == Polynomial([Scalar(0)] * self.group_order, Basis.LAGRANGE)
+            == zero_poly(self.group_order)
         )
         
         print("Successfully completed round 1")
@@ -139,37 +153,47 @@ class Prover:
         # Note the convenience function:
         #       self.rlc(val1, val2) = val_1 + self.beta * val_2 + gamma
         
-        # Retrieve roots of unity
-        roots_of_unity = Scalar.roots_of_unity(self.group_order)
+        # Retrieve roots of unity, along with their multiples by 2 and 3
+        roots_of_unity, two_roots, three_roots = Scalar.roots_of_unity_labels(
+            self.group_order
+        )
         
-        # Iteratively accumulate the grand product argument (permutation check
-        # passes if grand product == 1)          
-        Z_values = []
-        Z_values.append(Scalar(1))
-        for idx, i in enumerate(range(self.group_order), 1):
-            Z_values.append(Scalar(Z_values[idx - 1] * ((self.rlc(self.A.values[i], roots_of_unity[i]) 
-                * self.rlc(self.B.values[i], 2 * roots_of_unity[i])
-                * self.rlc(self.C.values[i], 3 * roots_of_unity[i])) /
-                (self.rlc(self.A.values[i], self.pk.S1.values[i]) 
-                * self.rlc(self.B.values[i], self.pk.S2.values[i])
-                * self.rlc(self.C.values[i], self.pk.S3.values[i])))))
-                    
+        # Compute the numerator and denominator of each step of the grand
+        # product (permutation check passes if grand product == 1)
+        numerators = [
+            self.rlc(self.A.values[i], roots_of_unity[i])
+            * self.rlc(self.B.values[i], two_roots[i])
+            * self.rlc(self.C.values[i], three_roots[i])
+            for i in range(self.group_order)
+        ]
+        denominators = [
+            self.rlc(self.A.values[i], self.pk.S1.values[i])
+            * self.rlc(self.B.values[i], self.pk.S2.values[i])
+            * self.rlc(self.C.values[i], self.pk.S3.values[i])
+            for i in range(self.group_order)
+        ]
+
+        # Invert all the denominators at once, then accumulate the ratios as
+        # plain integers, wrapping each running product only once
+        o = Scalar.field_modulus
+        inv_denominators = Scalar.batch_inverse(denominators)
+        ratios = [n.n * d.n % o for n, d in zip(numerators, inv_denominators)]
+        Z_values = [
+            Scalar.from_reduced(z)
+            for z in itertools.accumulate(ratios, lambda x, y: x * y % o, initial=1)
+        ]
+
         # Check that the last term Z_n = 1
         assert Z_values.pop() == 1
-                
+
         # Sanity-check that Z was computed correctly
-        for i in range(self.group_order):
-            assert (
-                self.rlc(self.A.values[i], roots_of_unity[i])
-                * self.rlc(self.B.values[i], 2 * roots_of_unity[i])
-                * self.rlc(self.C.values[i], 3 * roots_of_unity[i])
-            ) * Z_values[i] - (
-                self.rlc(self.A.values[i], self.pk.S1.values[i])
-                * self.rlc(self.B.values[i], self.pk.S2.values[i])
-                * self.rlc(self.C.values[i], self.pk.S3.values[i])
-            ) * Z_values[
-                (i + 1) % self.group_order
-            ] == 0
+        if self.debug:
+            for i in range(self.group_order):
+                assert (
+                    numerators[i] * Z_values[i]
+                    - denominators[i] * Z_values[(i + 1) % self.group_order]
+                    == 0
+                )
 
         # Construct Z, Lagrange interpolation polynomial for Z_values
         # Compute z_1 commitment to Z polynomial
@@ -204,13 +228,13 @@ class Prover:
         # Expand selector polynomials pk.QL, pk.QR, pk.QM, pk.QO, pk.QC
         # into the coset extended Lagrange basis
         self.QL_expanded, self.QR_expanded, self.QM_expanded, self.QO_expanded, self.QC_expanded = (
-            self.fft_expand(x)
-            for x in (
-                self.pk.QL,
-                self.pk.QR,
-                self.pk.QM,
-                self.pk.QO,
-                self.pk.QC
+            self.fft_expand_preprocessed(name, x)
+            for name, x in (
+                ("QL", self.pk.QL),
+                ("QR", self.pk.QR),
+                ("QM", self.pk.QM),
+                ("QO", self.pk.QO),
+                ("QC", self.pk.QC),
             )
         )
         
@@ -224,96 +248,92 @@ class Prover:
         # Expand permutation polynomials pk.S1, pk.S2, pk.S3 into coset
         # extended Lagrange basis
         self.S1_expanded, self.S2_expanded, self.S3_expanded = (
-            self.fft_expand(x)
-            for x in (
-                self.pk.S1,
-                self.pk.S2,
-                self.pk.S3,
+            self.fft_expand_preprocessed(name, x)
+            for name, x in (
+                ("S1", self.pk.S1),
+                ("S2", self.pk.S2),
+                ("S3", self.pk.S3),
             )
         )
         
-        # Compute Z_H = X^N - 1, also in evaluation form in the coset
-        self.Z_H = []
-        for r in self.roots_of_unity:
-            self.Z_H.append((Scalar(r) * self.fft_cofactor) ** self.group_order - 1)
-        self.Z_H = Polynomial(self.Z_H, Basis.LAGRANGE)
+        # Powers of the cofactor used below
+        cofactor_n = self.fft_cofactor ** self.group_order
+        cofactor_2n = cofactor_n * cofactor_n
+
+        # Compute Z_H = X^N - 1, also in evaluation form in the coset. With
+        # X = cofactor * µ^i, X^N = cofactor^N * µ^(iN), and µ^N is a 4th root
+        # of unity, so Z_H only takes 4 distinct values, repeating every 4
+        # lanes. Invert those 4 and tile both across the 4N lanes
+        Z_H_period = [
+            cofactor_n * self.roots_of_unity[k * self.group_order] - 1
+            for k in range(4)
+        ]
+        ZH_inv_period = Scalar.batch_inverse(Z_H_period)
+        self.Z_H = Polynomial(Z_H_period * self.group_order, Basis.LAGRANGE)
+        self.ZH_inv = Polynomial(ZH_inv_period * self.group_order, Basis.LAGRANGE)
 
         # Compute L0, the Lagrange basis polynomial that evaluates to 1 at x = 1 = ω^0
         # and 0 at other roots of unity. Expand L0 into the coset extended Lagrange basis
-        self.L0 = Polynomial([Scalar(1)] + [Scalar(0)] * (self.group_order - 1), Basis.LAGRANGE)
-        self.L0_expanded = self.fft_expand(self.L0)
+        self.L0 = l0_poly(self.group_order)
+        self.L0_expanded = self.fft_expand_preprocessed("L0", self.L0)
         
         # Compute the quotient polynomial (called T(x) in the paper)
         # It is only possible to construct this polynomial if the following
         # equations are true at all roots of unity {1, w ... w^(n-1)}:
         # 1. All gates are correct:
         #    A * QL + B * QR + A * B * QM + C * QO + PI + QC = 0
-        self.gates = (
-            (self.A_expanded * self.QL_expanded
-            + self.B_expanded * self.QR_expanded
-            + self.A_expanded * self.B_expanded * self.QM_expanded
-            + self.C_expanded * self.QO_expanded
-            + self.PI_expanded
-            + self.QC_expanded) / self.Z_H
-        )        
-        
+        #
         # 2. The permutation accumulator is valid:
         #    Z(wx) = Z(x) * (rlc of A, X, 1) * (rlc of B, 2X, 1) *
         #                   (rlc of C, 3X, 1) / (rlc of A, S1, 1) /
         #                   (rlc of B, S2, 1) / (rlc of C, S3, 1)
         #    rlc = random linear combination: term_1 + beta * term2 + gamma * term3
-        self.roots_of_unity_polynomial = Polynomial(self.roots_of_unity, Basis.LAGRANGE)
-        self.permutation_grand_product = ((
-            (self.rlc(self.A_expanded, self.roots_of_unity_polynomial * self.fft_cofactor)
-            * self.rlc(self.B_expanded, self.roots_of_unity_polynomial * (2 * self.fft_cofactor))
-            * self.rlc(self.C_expanded, self.roots_of_unity_polynomial * (3 * self.fft_cofactor))
-            * self.Z_expanded) * self.alpha
-        ) - (
-            (self.rlc(self.A_expanded, self.S1_expanded) 
-            * self.rlc(self.B_expanded, self.S2_expanded)
-            * self.rlc(self.C_expanded, self.S3_expanded)
-            * self.Z_W_expanded * self.alpha)
-        ) + (
-            (self.Z_expanded - Scalar(1)) * self.L0_expanded * (self.alpha * self.alpha)
-        )) / self.Z_H
-                
+        #
         # 3. The permutation accumulator equals 1 at the start point
         #    (Z - 1) * L0 = 0
         #    L0 = Lagrange polynomial, equal at all roots of unity except 1
-            
-        # Quotient polynomial
-        self.QUOT_expanded = self.gates + self.permutation_grand_product
-        
+        #
+        # All three are combined with powers of alpha and divided by Z_H in a
+        # single pass over the coset extended Lagrange basis
+        self.QUOT_expanded = self.quotient_kernel()
+
         # Normalize the quotient polynomial back to coefficient form without offset
         self.QUOT_coefficients = self.expanded_evals_to_coeffs(self.QUOT_expanded)
                 
         # Sanity check: QUOT has degree < 3n
-        assert (
-            self.QUOT_coefficients.values[-self.group_order:]
-            == [0] * self.group_order
-        )
+        if self.debug:
+            assert self.is_zero_from(
+                self.QUOT_coefficients.values, 3 * self.group_order
+            )
         
         print("Generated the quotient polynomial")
 
         # Split up T into T1, T2 and T3 (needed because T has degree 3n - 4, so is
         # too big for the trusted setup)
-        self.T1 = Polynomial(self.QUOT_coefficients.values[:self.group_order], Basis.MONOMIAL).fft()
-        self.T2 = Polynomial(self.QUOT_coefficients.values[self.group_order : 2 * self.group_order], Basis.MONOMIAL).fft()
-        self.T3 = Polynomial(self.QUOT_coefficients.values[2 * self.group_order : 3 * self.group_order], Basis.MONOMIAL).fft()
+        n = self.group_order
+        self.T1, self.T2, self.T3 = Polynomial.fft_batch(
+            [
+                Polynomial(
+                    self.QUOT_coefficients.values[i * n : (i + 1) * n],
+                    Basis.MONOMIAL,
+                )
+                for i in range(3)
+            ]
+        )
 
         # Sanity check that we've computed T1, T2, T3 correctly
         assert (
             self.T1.barycentric_eval(self.fft_cofactor)
-            + self.T2.barycentric_eval(self.fft_cofactor) * self.fft_cofactor ** self.group_order
-            + self.T3.barycentric_eval(self.fft_cofactor) * self.fft_cofactor ** (self.group_order * 2)
+            + self.T2.barycentric_eval(self.fft_cofactor) * cofactor_n
+            + self.T3.barycentric_eval(self.fft_cofactor) * cofactor_2n
         ) == self.QUOT_expanded.values[0]
         
         print("Generated T1, T2, T3 polynomials")
 
         # Compute commitments t_lo_1, t_mid_1, t_hi_1 to T1, T2, T3 polynomials
-        t_lo_1 = self.setup.commit(self.T1)        
-        t_mid_1 = self.setup.commit(self.T2)        
-        t_hi_1 = self.setup.commit(self.T3)   
+        t_lo_1, t_mid_1, t_hi_1 = self.setup.commit_batch(
+            [self.T1, self.T2, self.T3], self.executor
+        )
         
         print("Successfully completed round 3")
 
@@ -323,21 +343,19 @@ class Prover:
     def round_4(self) -> Message4:
         # Compute opening evaluations to be used in constructing the linearization polynomial.
 
-        # Compute a_eval = A(zeta)
-        self.a_eval = self.A.barycentric_eval(self.zeta)
-        
-        # Compute b_eval = B(zeta)
-        self.b_eval = self.B.barycentric_eval(self.zeta)
-        
-        # Compute c_eval = C(zeta)
-        self.c_eval = self.C.barycentric_eval(self.zeta)
-        
-        # Compute s1_eval = pk.S1(zeta)
-        self.s1_eval = self.pk.S1.barycentric_eval(self.zeta)
-        
-        # Compute s2_eval = pk.S2(zeta)
-        self.s2_eval = self.pk.S2.barycentric_eval(self.zeta)
-        
+        # Compute a_eval = A(zeta), b_eval = B(zeta), c_eval = C(zeta),
+        # s1_eval = pk.S1(zeta) and s2_eval = pk.S2(zeta), sharing the
+        # barycentric weights at zeta between all five
+        (
+            self.a_eval,
+            self.b_eval,
+            self.c_eval,
+            self.s1_eval,
+            self.s2_eval,
+        ) = Polynomial.barycentric_eval_batch(
+            [self.A, self.B, self.C, self.pk.S1, self.pk.S2], self.zeta
+        )
+
         # Compute z_shifted_eval = Z(zeta * ω)
         root_of_unity = Scalar.root_of_unity(self.group_order)
         self.z_shifted_eval = self.Z.barycentric_eval(self.zeta * root_of_unity)
@@ -348,11 +366,17 @@ class Prover:
         return Message4(self.a_eval, self.b_eval, self.c_eval, self.s1_eval, self.s2_eval, self.z_shifted_eval)
 
     def round_5(self) -> Message5:
-        # Evaluate the Lagrange basis polynomial L0 at zeta
-        self.L0_eval = self.L0.barycentric_eval(self.zeta)
+        # Evaluate the Lagrange basis polynomial L0 and the public input
+        # polynomial PI at zeta
+        self.L0_eval, self.PI_eval = Polynomial.barycentric_eval_batch(
+            [self.L0, self.PI], self.zeta
+        )
         
-        # Evaluate the vanishing polynomial Z_H(X) = X^n - 1 at zeta
-        self.Z_H_eval = self.zeta ** self.group_order - 1
+        # Evaluate the vanishing polynomial Z_H(X) = X^n - 1 at zeta, keeping
+        # zeta^n and zeta^2n around for recombining T1, T2, T3
+        self.zeta_n = self.zeta ** self.group_order
+        self.zeta_2n = self.zeta_n * self.zeta_n
+        self.Z_H_eval = self.zeta_n - 1
         
         # Move T1, T2, T3 into the coset extended Lagrange basis
         self.T1_expanded, self.T2_expanded, self.T3_expanded = (
@@ -364,10 +388,6 @@ class Prover:
             )
         )
         
-        # Evaluate the Lagrange basis polynomial PI at zeta
-        self.PI_eval = self.PI.barycentric_eval(self.zeta)
-        c_eval = Polynomial([self.c_eval] * self.group_order * 4, Basis.LAGRANGE)
-
         # Compute the "linearization polynomial" R. This is a clever way to avoid
         # needing to provide evaluations of _all_ the polynomials that we are
         # checking an equation betweeen: instead, we can "skip" the first
@@ -381,117 +401,66 @@ class Prover:
         # it has to be "linear" in the proof items, hence why we can only use each
         # proof item once; any further multiplicands in each term need to be
         # replaced with their evaluations at Z, which do still need to be provided
+        #
+        # R combines the gate constraints, the permutation grand product, the
+        # first row of the permutation and the quotient polynomial.
+        #
+        # In the same pass, construct the opening proof polynomial W_Z, which
+        # shows that W(z) = 0 and that the provided evaluations of A, B, C,
+        # S1, S2 are correct. In the COSET EXTENDED LAGRANGE BASIS,
+        # W_Z = (
+        #     R
+        #   + v * (A - a_eval)
+        #   + v**2 * (B - b_eval)
+        #   + v**3 * (C - c_eval)
+        #   + v**4 * (S1 - s1_eval)
+        #   + v**5 * (S2 - s2_eval)
+        # ) / (X - zeta)
+        # Each polynomial should have zeta as a root, so (X - zeta)
+        # should divide the whole sume evenly without remainder.
+        self.quarter_roots = Polynomial(self.roots_of_unity, Basis.LAGRANGE)
+        self.R_argument, self.W_Z_argument = self.linearization_kernel()
 
-        # Calculate the gate constraints
-        self.gates = (
-            self.QL_expanded * self.a_eval
-            + self.QR_expanded * self.b_eval
-            + self.QM_expanded * self.a_eval * self.b_eval
-            + self.QO_expanded * self.c_eval
-            + self.PI_eval
-            + self.QC_expanded
-        )   
-        
-        # Calculate the permutation grant product
-        self.permutation_grand_product = (
-            self.Z_expanded * (  
-                self.rlc(self.a_eval, self.zeta) 
-                * self.rlc(self.b_eval, 2 * self.zeta) 
-                * self.rlc(self.c_eval, 3 * self.zeta)
-            ) - (
-                self.rlc(c_eval, self.S3_expanded)
-                * self.rlc(self.a_eval, self.s1_eval)
-                * self.rlc(self.b_eval, self.s2_eval)
-            ) * 
-                self.z_shifted_eval
-        )
-        
-        # Calculate the first row of the permutation
-        self.permutation = (self.Z_expanded - Scalar(1)) * self.L0_eval
-        
-        # Calculate the quotient polynomial
-        self.T_argument = (
-            self.T1_expanded
-            + self.T2_expanded * (self.zeta ** self.group_order)
-            + self.T3_expanded * (self.zeta ** (2 * self.group_order))
-        )
-                
-        # Calculate the linearization polynomial
-        self.R_argument = (
-            self.gates 
-            + self.permutation_grand_product * self.alpha
-            + self.permutation * (self.alpha ** 2) 
-            - self.T_argument
-            * self.Z_H_eval
-        )
-        
         # Normalize the linearization polynomial back to coefficient form
         R_coeffs = self.expanded_evals_to_coeffs(self.R_argument).values
-        assert R_coeffs[self.group_order:] == [0] * (self.group_order * 3)
+        if self.debug:
+            assert self.is_zero_from(R_coeffs, self.group_order)
         self.R = Polynomial(R_coeffs[:self.group_order], Basis.MONOMIAL).fft()
-                        
-        # Commit to R
-        self.R_commit = self.setup.commit(self.R)    
-        
+
         # Sanity-check R
         assert self.R.barycentric_eval(self.zeta) == 0
         
         print("Generated linearization polynomial R")
-        
-        # Generate opening proof polynomial W_Z that W(z) = 0 and that the provided evaluations of
-        # A, B, C, S1, S2 are correct
-        self.quarter_roots = Polynomial(self.roots_of_unity, Basis.LAGRANGE)
-        self.root_of_unity = Scalar.root_of_unity(self.group_order)
 
-        # In the COSET EXTENDED LAGRANGE BASIS,
-        # Construct W_Z = (
-        #     R
-        #   + v * (A - a_eval)
-        #   + v**2 * (B - b_eval)
-        #   + v**3 * (C - c_eval)
-        #   + v**4 * (S1 - s1_eval)
-        #   + v**5 * (S2 - s2_eval)
-        # ) / (X - zeta)
-        # Each polynomial should have zeta as a root, so (X - zeta)
-        # should divide the whole sume evenly without remainder. 
-        self.W_Z_argument = (
-            self.R_argument
-            + (self.A_expanded - self.a_eval) * self.v
-            + (self.B_expanded - self.b_eval) * (self.v ** 2)
-            + (self.C_expanded - self.c_eval) * (self.v ** 3)
-            + (self.S1_expanded - self.s1_eval) * (self.v ** 4)
-            + (self.S2_expanded - self.s2_eval) * (self.v ** 5) 
-        ) / (self.quarter_roots * self.fft_cofactor - self.zeta)
-                
         W_z_coeffs = self.expanded_evals_to_coeffs(self.W_Z_argument).values
-        assert W_z_coeffs[self.group_order:] == [0] * (self.group_order * 3)
         self.W_z = Polynomial(W_z_coeffs[:self.group_order], Basis.MONOMIAL).fft()
         
         # Check that degree of W_z is not greater than n
-        assert W_z_coeffs[self.group_order:] == [0] * (self.group_order * 3)
-        
-        # Compute W_z_1 commitment to W_z
-        self.W_z_1 = self.setup.commit(self.W_z)    
+        if self.debug:
+            assert self.is_zero_from(W_z_coeffs, self.group_order)
         
         # Generate proof that the provided evaluation of Z(z*w) is correct. This
         # awkwardly different term is needed because the permutation accumulator
         # polynomial Z is the one place where we have to check between adjacent
         # coordinates, and not just within one coordinate.
         # In other words: Compute W_zw = (Z - z_shifted_eval) / (X - zeta * ω)
-        self.W_zw_argument = (
-            (self.Z_expanded - self.z_shifted_eval) / 
-            (self.quarter_roots * self.fft_cofactor - self.root_of_unity * self.zeta)
+        self.root_of_unity = Scalar.root_of_unity(self.group_order)
+        divisor = (
+            self.quarter_roots * self.fft_cofactor - self.root_of_unity * self.zeta
         )
+        self.W_zw_argument = (self.Z_expanded - self.z_shifted_eval) * divisor.inverse()
         
         W_zw_coeffs = self.expanded_evals_to_coeffs(self.W_zw_argument).values
-        assert W_zw_coeffs[self.group_order:] == [0] * (self.group_order * 3)
         self.W_zw = Polynomial(W_zw_coeffs[:self.group_order], Basis.MONOMIAL).fft()
         
-        # Check that degree of W_z is not greater than n
-        assert W_zw_coeffs[self.group_order:] == [0] * (self.group_order * 3)
+        # Check that degree of W_zw is not greater than n
+        if self.debug:
+            assert self.is_zero_from(W_zw_coeffs, self.group_order)
         
-        # Compute W_zw_1 commitment to W_zw
-        self.W_zw_1 = self.setup.commit(self.W_zw)
+        # Compute R_commit, W_z_1 and W_zw_1 commitments to R, W_z and W_zw
+        self.R_commit, self.W_z_1, self.W_zw_1 = self.setup.commit_batch(
+            [self.R, self.W_z, self.W_zw], self.executor
+        )
 
         print("Generated final quotient witness polynomials")
         print("Successfully completed round 5")
@@ -499,11 +468,195 @@ class Prover:
         # Return W_z_1, W_zw_1
         return Message5(self.W_z_1, self.W_zw_1)
 
+    # Evaluates the quotient polynomial in the coset extended Lagrange basis,
+    # reading each expanded input once per lane instead of materializing an
+    # intermediate Polynomial for every addition and multiplication
+    def quotient_kernel(self) -> Polynomial:
+        o = Scalar.field_modulus
+        A, B, C = (
+            [x.n for x in p.values]
+            for p in (self.A_expanded, self.B_expanded, self.C_expanded)
+        )
+        QL, QR, QM, QO, QC = (
+            [x.n for x in p.values]
+            for p in (
+                self.QL_expanded,
+                self.QR_expanded,
+                self.QM_expanded,
+                self.QO_expanded,
+                self.QC_expanded,
+            )
+        )
+        S1, S2, S3 = (
+            [x.n for x in p.values]
+            for p in (self.S1_expanded, self.S2_expanded, self.S3_expanded)
+        )
+        PI = [x.n for x in self.PI_expanded.values]
+        Z = [x.n for x in self.Z_expanded.values]
+        ZW = [x.n for x in self.Z_W_expanded.values]
+        L0 = [x.n for x in self.L0_expanded.values]
+        ZH_inv = [x.n for x in self.ZH_inv.values]
+
+        alpha, beta, gamma = self.alpha.n, self.beta.n, self.gamma.n
+        alpha_sq = alpha * alpha % o
+        cofactor = self.fft_cofactor.n
+
+        quot = [FR_ZERO] * (self.group_order * 4)
+        for i, root in enumerate(self.roots_of_unity):
+            a, b, c = A[i], B[i], C[i]
+            beta_x = beta * root.n * cofactor % o
+            gates = (
+                a * QL[i] + b * QR[i] + a * b % o * QM[i] + c * QO[i] + PI[i] + QC[i]
+            )
+            permutation_grand_product = (
+                (a + beta_x + gamma)
+                * (b + 2 * beta_x + gamma)
+                % o
+                * (c + 3 * beta_x + gamma)
+                % o
+                * Z[i]
+                - (a + beta * S1[i] + gamma)
+                * (b + beta * S2[i] + gamma)
+                % o
+                * (c + beta * S3[i] + gamma)
+                % o
+                * ZW[i]
+            )
+            permutation_first_row = (Z[i] - 1) * L0[i]
+            quot[i] = Scalar.from_reduced(
+                (
+                    gates
+                    + alpha * permutation_grand_product
+                    + alpha_sq * permutation_first_row
+                )
+                % o
+                * ZH_inv[i]
+                % o
+            )
+        return Polynomial(quot, Basis.LAGRANGE)
+
+    # Evaluates the linearization polynomial R and the opening proof polynomial
+    # W_Z in the coset extended Lagrange basis in a single pass, reading each
+    # expanded input once per lane
+    def linearization_kernel(self) -> tuple[Polynomial, Polynomial]:
+        o = Scalar.field_modulus
+        QL, QR, QM, QO, QC = (
+            [x.n for x in p.values]
+            for p in (
+                self.QL_expanded,
+                self.QR_expanded,
+                self.QM_expanded,
+                self.QO_expanded,
+                self.QC_expanded,
+            )
+        )
+        A, B, C, S1, S2, S3 = (
+            [x.n for x in p.values]
+            for p in (
+                self.A_expanded,
+                self.B_expanded,
+                self.C_expanded,
+                self.S1_expanded,
+                self.S2_expanded,
+                self.S3_expanded,
+            )
+        )
+        Z = [x.n for x in self.Z_expanded.values]
+        T1, T2, T3 = (
+            [x.n for x in p.values]
+            for p in (self.T1_expanded, self.T2_expanded, self.T3_expanded)
+        )
+        divisor = self.quarter_roots * self.fft_cofactor - self.zeta
+        inv_divisor = [x.n for x in divisor.inverse().values]
+
+        a, b, c = self.a_eval.n, self.b_eval.n, self.c_eval.n
+        s1, s2 = self.s1_eval.n, self.s2_eval.n
+        alpha, beta, gamma = self.alpha.n, self.beta.n, self.gamma.n
+        alpha_sq = alpha * alpha % o
+        zeta = self.zeta.n
+        zeta_n, zeta_2n = self.zeta_n.n, self.zeta_2n.n
+        v = self.v.n
+        v_powers = [v]
+        for _ in range(4):
+            v_powers.append(v_powers[-1] * v % o)
+        v1, v2, v3, v4, v5 = v_powers
+
+        # Everything that only depends on the evaluations is computed once
+        ab = a * b % o
+        gates_const = self.PI_eval.n
+        permutation_z_coeff = (
+            alpha
+            * (a + beta * zeta + gamma)
+            % o
+            * (b + 2 * beta * zeta + gamma)
+            % o
+            * (c + 3 * beta * zeta + gamma)
+            % o
+        )
+        permutation_s3_coeff = (
+            alpha
+            * (a + beta * s1 + gamma)
+            % o
+            * (b + beta * s2 + gamma)
+            % o
+            * self.z_shifted_eval.n
+            % o
+        )
+        first_row_coeff = alpha_sq * self.L0_eval.n % o
+        ZH_eval = self.Z_H_eval.n
+        openings_const = v1 * a + v2 * b + v3 * c + v4 * s1 + v5 * s2
+
+        R = [FR_ZERO] * (self.group_order * 4)
+        W_Z = [FR_ZERO] * (self.group_order * 4)
+        for i in range(self.group_order * 4):
+            r = (
+                QL[i] * a
+                + QR[i] * b
+                + QM[i] * ab
+                + QO[i] * c
+                + gates_const
+                + QC[i]
+                + Z[i] * permutation_z_coeff
+                - (c + beta * S3[i] + gamma) * permutation_s3_coeff
+                + (Z[i] - 1) * first_row_coeff
+                - (T1[i] + T2[i] * zeta_n + T3[i] * zeta_2n) % o * ZH_eval
+            ) % o
+            R[i] = Scalar.from_reduced(r)
+            W_Z[i] = Scalar.from_reduced(
+                (
+                    r
+                    + v1 * A[i]
+                    + v2 * B[i]
+                    + v3 * C[i]
+                    + v4 * S1[i]
+                    + v5 * S2[i]
+                    - openings_const
+                )
+                % o
+                * inv_divisor[i]
+                % o
+            )
+        return Polynomial(R, Basis.LAGRANGE), Polynomial(W_Z, Basis.LAGRANGE)
+
     def fft_expand(self, x: Polynomial):
         return x.to_coset_extended_lagrange(self.fft_cofactor)
 
+    # The preprocessed polynomials only depend on the circuit, so their
+    # monomial coefficients are computed once per Prover and saved across
+    # proofs. The coset expansion depends on the cofactor, so it is redone
+    def fft_expand_preprocessed(self, name: str, x: Polynomial):
+        if name not in self.coeffs_cache:
+            self.coeffs_cache[name] = x.ifft()
+        return self.fft_expand(self.coeffs_cache[name])
+
     def expanded_evals_to_coeffs(self, x: Polynomial):
         return x.coset_extended_lagrange_to_coeffs(self.fft_cofactor)
 
     def rlc(self, term_1, term_2):
         return term_1 + term_2 * self.beta + self.gamma
+
+    # Checks that all values from index start onwards are zero, without
+    # allocating a slice or a list of zeros to compare against
+    @staticmethod
+    def is_zero_from(values: list[Scalar], start: int) -> bool:
+        return all(x == 0 for x in itertools.islice(values, start, None))
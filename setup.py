@@ -1,10 +1,12 @@
 from utils import *
 import py_ecc.bn128 as b
-from curve import ec_lincomb, G1Point, G2Point
+from curve import ec_lincomb, ec_lincomb_batch, G1Point, G2Point
 from compiler.program import CommonPreprocessedInput
 from verifier import VerificationKey
 from dataclasses import dataclass
 from poly import Polynomial, Basis
+from concurrent.futures import Executor
+from typing import Optional
 
 # Recover the trusted setup from a file in the format used in
 # https://github.com/iden3/snarkjs#7-prepare-phase-2
@@ -66,29 +68,45 @@ class Setup(object):
         # Run inverse FFT to convert values from Lagrange basis to monomial basis
         # Optional: Check values size does not exceed maximum power setup can handle
         # Compute linear combination of setup with values
-        assert values.basis == Basis.LAGRANGE
-        assert len(values.values) <= len(self.powers_of_x)
-        poly_coeff_in_rou = values.ifft()        
-        # Powers of tau is sliced to ensure it matches the polynoial coefficients
-        kzg_commitment = ec_lincomb(list(zip(self.powers_of_x[: len(values.values)], poly_coeff_in_rou.values)))
-        
-        return kzg_commitment
+        return self.commit_batch([values])[0]
+
+    # Encodes KZG commitments to several polynomials of the same size at once,
+    # sharing the precomputation over the setup between all of them. If an
+    # executor is given, the commitments are instead computed independently
+    # on its workers, which pays off once there are cores to spare (use a
+    # process pool: the curve arithmetic holds the GIL)
+    def commit_batch(
+        self, polys: list[Polynomial], executor: Optional[Executor] = None
+    ) -> list[G1Point]:
+        assert all(p.basis == Basis.LAGRANGE for p in polys)
+        size = len(polys[0].values)
+        assert all(len(p.values) == size for p in polys)
+        assert size <= len(self.powers_of_x)
+        points = self.powers_of_x[:size]
+        coeffs = [p.ifft().values for p in polys]
+        if executor is not None:
+            pairs = [list(zip(points, c)) for c in coeffs]
+            return list(executor.map(ec_lincomb, pairs))
+        return ec_lincomb_batch(points, coeffs)
 
     # Generate the verification key for this program with the given setup
     def verification_key(self, pk: CommonPreprocessedInput) -> VerificationKey:
         # Create the appropriate VerificationKey object, which contains
         # commitments to selector and permutation polynomials, G2 element
         # from SRS, and nth root of unity        
+        Qm, Ql, Qr, Qo, Qc, S1, S2, S3 = self.commit_batch(
+            [pk.QM, pk.QL, pk.QR, pk.QO, pk.QC, pk.S1, pk.S2, pk.S3]
+        )
         vk_key = VerificationKey(
             group_order=pk.group_order,
-            Qm=self.commit(pk.QM),
-            Ql=self.commit(pk.QL),
-            Qr=self.commit(pk.QR),
-            Qo=self.commit(pk.QO),
-            Qc=self.commit(pk.QC),
-            S1=self.commit(pk.S1),
-            S2=self.commit(pk.S2),
-            S3=self.commit(pk.S3),
+            Qm=Qm,
+            Ql=Ql,
+            Qr=Qr,
+            Qo=Qo,
+            Qc=Qc,
+            S1=S1,
+            S2=S2,
+            S3=S3,
             X_2=self.X2,
             w=Scalar.root_of_unity(pk.group_order)
         )
@@ -104,7 +104,7 @@ def prover_test_dummy_verifier(setup):
     print("Beginning prover test with test verifier")
     program = Program(["e public", "c <== a * b", "e <== c * d"], 8)
     assignments = {"a": 3, "b": 4, "c": 12, "d": 5, "e": 60}
-    prover = Prover(setup, program)
+    prover = Prover(setup, program, debug=True)
     proof = prover.prove(assignments) # type: ignore
 
     print("Beginning test verification")
@@ -137,7 +137,7 @@ def prover_test(setup):
     print("Beginning prover test")
     program = Program(["e public", "c <== a * b", "e <== c * d"], 8)
     assignments = {"a": 3, "b": 4, "c": 12, "d": 5, "e": 60}
-    prover = Prover(setup, program)
+    prover = Prover(setup, program, debug=True)
     proof = prover.prove(assignments) # type: ignore
     print("Prover test success")
     return proof
@@ -204,7 +204,7 @@ def factorization_test(setup):
             "qb0": 1,
         }
     )
-    prover = Prover(setup, program)
+    prover = Prover(setup, program, debug=True)
     proof = prover.prove(assignments)
     print("Generated proof")
     assert vk.verify_proof(16, proof, public)
@@ -250,7 +250,7 @@ def poseidon_test(setup):
     assignments = program.fill_variable_assignments({"L0": 1, "M0": 2})
     vk = setup.verification_key(program.common_preprocessed_input())
     print("Generated verification key")
-    prover = Prover(setup, program)
+    prover = Prover(setup, program, debug=True)
     proof = prover.prove(assignments)
     print("Generated proof")
     assert vk.verify_proof(1024, proof, [1, 2, expected_value])
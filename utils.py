@@ -1,5 +1,7 @@
 import py_ecc.bn128 as b
-from curve import Scalar
+from curve import Scalar, FR_ZERO, FR_ONE
+from poly import Polynomial, Basis
+import functools
 
 f = b.FQ
 f2 = b.FQ2
@@ -20,3 +22,18 @@ def interpret_json_point(p):
     elif len(p) == 3 and p == [["0", "0"], ["1", "0"], ["0", "0"]]:
         return b.Z2
     raise Exception("cannot interpret that point: {}".format(p))
+
+
+# The all-zero polynomial in Lagrange basis over a group of the given order.
+# Cached per order: callers must treat the result as read-only
+@functools.lru_cache(maxsize=None)
+def zero_poly(group_order: int) -> Polynomial:
+    return Polynomial([FR_ZERO] * group_order, Basis.LAGRANGE)
+
+
+# L0, the Lagrange basis polynomial that evaluates to 1 at x = 1 = ω^0 and 0
+# at the other roots of unity. Cached per order: callers must treat the
+# result as read-only
+@functools.lru_cache(maxsize=None)
+def l0_poly(group_order: int) -> Polynomial:
+    return Polynomial([FR_ONE] + [FR_ZERO] * (group_order - 1), Basis.LAGRANGE)